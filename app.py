@@ -1,10 +1,22 @@
 import streamlit as st
 import pickle
-import pandas as pd
-import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import simsimd
+    HAS_SIMSIMD = True
+except ImportError:
+    HAS_SIMSIMD = False
+
 # ==================== CONFIG ====================
 st.set_page_config(
     page_title="CineSuggest 🎬", 
@@ -16,6 +28,31 @@ st.set_page_config(
 # Get API key from environment variable
 API_KEY = os.environ.get("TMDB_API_KEY", "8265bd1679663a7ea12ac168da84d2e8")  # Fallback to public key
 
+# L2-normalized feature vectors written by the notebook. When present, cosine
+# similarity is computed on demand and the precomputed matrix is not needed.
+FEATURES_FILE = 'features.npy'
+
+# ==================== HTTP SESSION ====================
+@st.cache_resource
+def get_session():
+    """
+    Pooled session so TMDB connections (and their TLS handshakes) are reused
+    
+    requests is imported here so script runs that never make an HTTP call
+    don't pay for the import.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    ))
+    return session
+
 # ==================== DOWNLOAD PICKLE FILES FROM HUGGINGFACE ====================
 @st.cache_data
 def download_pickle_files():
@@ -23,14 +60,15 @@ def download_pickle_files():
     
     files_to_download = {
         'movies_dict.pkl': 'https://huggingface.co/datasets/aayush369/Cine-suggest/resolve/main/movies_dict.pkl',
-        'similarity.pkl': 'https://huggingface.co/datasets/aayush369/Cine-suggest/resolve/main/similarity.pkl'
     }
+    if not os.path.exists(FEATURES_FILE):
+        files_to_download['similarity.pkl'] = 'https://huggingface.co/datasets/aayush369/Cine-suggest/resolve/main/similarity.pkl'
     
     for filename, url in files_to_download.items():
         if not os.path.exists(filename):
             try:
                 st.info(f"📥 Downloading {filename} from HuggingFace... (this may take a minute)")
-                response = requests.get(url, stream=True, timeout=120)
+                response = get_session().get(url, stream=True, timeout=120)
                 response.raise_for_status()
                 
                 with open(filename, 'wb') as f:
@@ -45,57 +83,267 @@ def download_pickle_files():
 # Download files on first run
 download_pickle_files()
 
-# ==================== LOAD DATA ====================
-@st.cache_data
-def load_data():
-    """Load pickled data (cached for performance)"""
+# ==================== CONVERT DATA FILES ====================
+SIMILARITY_FILE = 'similarity.npy'
+TITLES_FILE = 'titles.npy'
+IDS_FILE = 'ids.npy'
+
+SIMILARITY_DTYPE = np.float32
+
+def is_stale(target, source):
+    """True if a derived file is missing or older than the file it was built from"""
+    return not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source)
+
+def save_npy_atomic(path, array):
+    """
+    Write an .npy file via a temp file and os.replace
+    
+    Replacing gives the file a new inode, so a memmap still open on the old
+    version keeps reading consistent data instead of a truncated file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+def convert_similarity():
+    """Re-serialize similarity.pkl as a float32 .npy file that can be memory-mapped"""
+    if os.path.exists(FEATURES_FILE):
+        return
+    if (not is_stale(SIMILARITY_FILE, 'similarity.pkl')
+            and np.load(SIMILARITY_FILE, mmap_mode='r').dtype == SIMILARITY_DTYPE):
+        return
+    
     try:
-        with open('movies_dict.pkl', 'rb') as f:
-            movies_dict = pickle.load(f)
-        movies = pd.DataFrame(movies_dict)
-        
         with open('similarity.pkl', 'rb') as f:
             similarity = pickle.load(f)
-        
-        return movies, similarity
-    except (FileNotFoundError, pickle.UnpicklingError) as e:
-        st.error(f"❌ Error loading data files: {str(e)}")
-        st.info("💡 Data files are being downloaded from HuggingFace")
+        # float32 halves the bytes walked per query and keeps top-k ordering stable
+        similarity = np.asarray(similarity).astype(SIMILARITY_DTYPE, copy=False)
+        save_npy_atomic(SIMILARITY_FILE, np.ascontiguousarray(similarity))
+    except Exception as e:
+        st.error(f"❌ Failed to convert similarity matrix: {str(e)}")
         st.stop()
+
+def resolve_columns(movies_dict):
+    """Handle different column names (title_x or title, movie_id or id)"""
+    title_col = 'title_x' if 'title_x' in movies_dict else 'title'
+    id_col = 'movie_id' if 'movie_id' in movies_dict else 'id'
+    return title_col, id_col
+
+def convert_movies():
+    """Extract the title and id columns of movies_dict.pkl into .npy arrays"""
+    if not is_stale(TITLES_FILE, 'movies_dict.pkl') and not is_stale(IDS_FILE, 'movies_dict.pkl'):
+        return
+    
+    try:
+        with open('movies_dict.pkl', 'rb') as f:
+            movies_dict = pickle.load(f)
+        # Columns are {row_label: value} dicts in DataFrame row order
+        title_col, id_col = resolve_columns(movies_dict)
+        save_npy_atomic(TITLES_FILE, np.asarray(list(movies_dict[title_col].values()), dtype=object))
+        save_npy_atomic(IDS_FILE, np.asarray(list(movies_dict[id_col].values()), dtype=np.int32))
     except Exception as e:
-        st.error(f"❌ Unexpected error: {str(e)}")
+        st.error(f"❌ Failed to convert movie data: {str(e)}")
         st.stop()
 
-movies, similarity = load_data()
+# ==================== LOAD DATA ====================
 
-# ==================== TMDB API FUNCTIONS ====================
-def fetch_poster(movie_id):
-    """Fetch movie poster from TMDB API"""
+def handle_load_error(e):
+    """Report a data loading failure and halt the script"""
+    if isinstance(e, (FileNotFoundError, pickle.UnpicklingError, ValueError)):
+        st.error(f"❌ Error loading data files: {str(e)}")
+        st.info("💡 Data files are being downloaded from HuggingFace")
+    else:
+        st.error(f"❌ Unexpected error: {str(e)}")
+    st.stop()
+
+def source_mtimes():
+    """Modification times of the source data files, used as the load_data cache key"""
+    sources = ['movies_dict.pkl', 'similarity.pkl', FEATURES_FILE]
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in sources)
+
+@st.cache_resource(max_entries=1)
+def load_data(mtimes):
+    """
+    Load the similarity matrix (or feature vectors) and movie arrays, shared across sessions
+    
+    Keyed on the source mtimes so re-exported pickles reload everything
+    together. Conversion runs here, so it happens once per key under the
+    cache's lock rather than on every rerun.
+    """
     try:
-        url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={API_KEY}&language=en-US"
-        response = requests.get(url, timeout=5)
-        data = response.json()
-        poster_path = data.get('poster_path')
-        if poster_path:
-            return f"https://image.tmdb.org/t/p/w500/{poster_path}"
-        return "https://via.placeholder.com/500x750?text=No+Poster"
-    except:
-        return "https://via.placeholder.com/500x750?text=No+Poster"
+        convert_similarity()
+        convert_movies()
+        
+        # Memory-mapped, so only the rows actually queried are paged in
+        if os.path.exists(FEATURES_FILE):
+            similarity, features = None, np.load(FEATURES_FILE, mmap_mode='r')
+            if not HAS_SIMSIMD:
+                # numpy has no BLAS path for float16, so upcast once for the fallback
+                features = np.asarray(features, dtype=np.float32)
+        else:
+            similarity, features = np.load(SIMILARITY_FILE, mmap_mode='r'), None
+        
+        titles = np.load(TITLES_FILE, allow_pickle=True)
+        ids = np.load(IDS_FILE)
+        
+        num_rows = (similarity if similarity is not None else features).shape[0]
+        if not len(titles) == len(ids) == num_rows:
+            st.error(f"❌ Data files are out of step: {len(titles)} titles and {len(ids)} ids for {num_rows} similarity rows")
+            st.info("💡 Regenerate the data files from the same notebook run")
+            st.stop()
+        
+        # Positional lookups so recommendations never scan the catalog
+        title_to_indices = {}
+        for i, t in enumerate(titles):
+            title_to_indices.setdefault(t, []).append(i)
+        # Queries use the first match, like .index[0]
+        title_to_idx = {t: rows[0] for t, rows in title_to_indices.items()}
+        
+        return similarity, features, title_to_idx, title_to_indices, titles, ids
+    except Exception as e:
+        handle_load_error(e)
+
+similarity, features, TITLE_TO_IDX, TITLE_TO_INDICES, TITLES_ARR, IDS_ARR = load_data(source_mtimes())
 
-def fetch_movie_details(movie_id):
-    """Fetch additional movie details from TMDB"""
+# ==================== TMDB API FUNCTIONS ====================
+PLACEHOLDER_POSTER = "https://via.placeholder.com/500x750?text=No+Poster"
+
+# Posters render at 120-150px or in a 3-column grid, so w342 is plenty
+POSTER_SIZE = 'w342'
+
+@st.cache_data(ttl=60*60*24, max_entries=20000, show_spinner=False)
+def fetch_tmdb_movie(movie_id):
+    """Fetch raw TMDB movie JSON (cached; failures raise and are not cached)"""
+    url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={API_KEY}&language=en-US"
+    response = get_session().get(url, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_movie(movie_id):
+    """Fetch poster and details for a movie with a single TMDB request"""
     try:
-        url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={API_KEY}&language=en-US"
-        response = requests.get(url, timeout=5)
-        data = response.json()
+        data = fetch_tmdb_movie(movie_id)
+        poster_path = data.get('poster_path')
         return {
+            'poster_url': f"https://image.tmdb.org/t/p/{POSTER_SIZE}/{poster_path}" if poster_path else PLACEHOLDER_POSTER,
             'rating': data.get('vote_average', 'N/A'),
             'year': data.get('release_date', '')[:4] if data.get('release_date') else 'N/A',
             'overview': data.get('overview', 'No description available.'),
             'genres': ', '.join([g['name'] for g in data.get('genres', [])])
         }
     except:
-        return {'rating': 'N/A', 'year': 'N/A', 'overview': 'N/A', 'genres': 'N/A'}
+        return {'poster_url': PLACEHOLDER_POSTER, 'rating': 'N/A', 'year': 'N/A', 'overview': 'N/A', 'genres': 'N/A'}
+
+@st.cache_data(ttl=60*60*24, max_entries=1000, show_spinner=False)
+def get_poster_bytes(url):
+    """Fetch poster image bytes server-side so reruns serve them from memory (failures raise and are not cached)"""
+    response = get_session().get(url, timeout=5)
+    response.raise_for_status()
+    return response.content
+
+def fetch_movie_with_poster(movie_id):
+    """
+    Fetch a movie's details plus a ready-to-render poster
+    
+    details['poster'] holds the cached image bytes, or the poster URL for the
+    browser to load when there is no poster or the download failed.
+    """
+    details = fetch_movie(movie_id)
+    details['poster'] = details['poster_url']
+    if details['poster_url'] != PLACEHOLDER_POSTER:
+        try:
+            details['poster'] = get_poster_bytes(details['poster_url'])
+        except:
+            pass
+    return details
+
+def fetch_movies(movie_ids):
+    """Fetch several movies (and their posters) from TMDB in parallel, keyed by movie id"""
+    unique_ids = list(dict.fromkeys(movie_ids))
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        return dict(zip(unique_ids, executor.map(fetch_movie_with_poster, unique_ids)))
+
+# ==================== RANKING KERNELS ====================
+@st.cache_resource
+def get_masked_sum_kernel():
+    """
+    Build and compile the Numba ranking kernel once per process
+    
+    Streamlit re-executes the script on every rerun, so a module-level @njit
+    function would be a fresh dispatcher each time. No on-disk cache: Numba
+    can't reload kernels defined in a script Streamlit executes. Warm-up uses
+    a read-only dummy because the real argument is the read-only memmap,
+    which Numba types (and compiles) separately from a writable array.
+    """
+    @njit(parallel=True)
+    def masked_sum(sim, indices, out):
+        """Sum of the seed rows into out in one pass over memory, seeds set to -inf"""
+        n = sim.shape[1]
+        for c in prange(n):
+            total = 0.0
+            for i in indices:
+                total += sim[i, c]
+            out[c] = total
+        for i in indices:
+            out[i] = -np.inf
+        return out
+    
+    dummy = np.zeros((2, 2), dtype=similarity.dtype)
+    dummy.setflags(write=False)
+    masked_sum(dummy, np.zeros(1, dtype=np.int64), np.empty(2, dtype=similarity.dtype))
+    return masked_sum
+
+def dot_scores(query):
+    """
+    Dot product of a query vector against every movie's features
+    
+    Feature rows are L2-normalized, so a single movie's row scores its cosine
+    similarity, and a sum of rows scores the sum of their cosine similarities.
+    """
+    if HAS_SIMSIMD:
+        query = np.asarray(query, dtype=features.dtype)
+        scores = simsimd.cdist(query[np.newaxis], features, metric='dot')
+        return np.asarray(scores, dtype=np.float32).ravel()
+    return features @ np.asarray(query, dtype=np.float32)
+
+def similarity_row(index):
+    """Similarity of one movie against every movie"""
+    if features is not None:
+        return dot_scores(features[index])
+    return np.asarray(similarity[index])
+
+def use_numba_kernel():
+    """The kernel runs over the similarity matrix, so it is unused on the feature-vector path"""
+    return HAS_NUMBA and similarity is not None
+
+def masked_sum_similarity(indices):
+    """
+    Sum the similarity rows of the seed movies, masking the seeds themselves
+    
+    The sum ranks identically to the mean; callers divide by len(indices)
+    only for the scores they display.
+    """
+    if features is not None:
+        # The dot product is linear in the query, so the sum of scores is the score of the summed vector
+        sum_similarity = dot_scores(features[indices].sum(axis=0, dtype=np.float32))
+        sum_similarity[indices] = -np.inf
+        return sum_similarity
+    # One N-element result per call; no k x N temporary and no separate mean pass
+    sum_similarity = np.empty(similarity.shape[1], dtype=similarity.dtype)
+    if use_numba_kernel():
+        kernel = get_masked_sum_kernel()
+        return kernel(similarity, np.asarray(indices, dtype=np.int64), sum_similarity)
+    # Accumulate row by row in place rather than materializing similarity[indices]
+    np.copyto(sum_similarity, similarity[indices[0]])
+    for i in indices[1:]:
+        np.add(sum_similarity, similarity[i], out=sum_similarity)
+    sum_similarity[indices] = -np.inf
+    return sum_similarity
+
+# Compile the ranking kernel at startup so the first click doesn't pay JIT cost
+if use_numba_kernel():
+    get_masked_sum_kernel()
 
 # ==================== RECOMMENDATION ENGINE ====================
 def recommend(movie, num_recommendations=5, min_similarity=0.0):
@@ -110,23 +358,31 @@ def recommend(movie, num_recommendations=5, min_similarity=0.0):
     Returns:
         list: List of dicts with movie info
     """
+    # Stale or empty titles from a rerun cost one hash probe, not a ranking pass
+    if movie not in TITLE_TO_IDX:
+        return []
+    
     try:
-        # Handle different column names (title_x or title)
-        title_col = 'title_x' if 'title_x' in movies.columns else 'title'
-        id_col = 'movie_id' if 'movie_id' in movies.columns else 'id'
+        movie_index = TITLE_TO_IDX[movie]
+        distances = similarity_row(movie_index)
         
-        movie_index = movies[movies[title_col] == movie].index[0]
-        distances = similarity[movie_index]
-        movies_list = sorted(list(enumerate(distances)), reverse=True, key=lambda x: x[1])[1:num_recommendations+1]
+        k = min(num_recommendations + 1, len(distances))
+        if k == len(distances):
+            # Asking for the whole catalog, so partitioning would be wasted work
+            movies_list = np.argsort(distances)[::-1][1:]
+        else:
+            # Partial top-k selection; only the k survivors get sorted
+            top = np.argpartition(distances, -k)[-k:]
+            movies_list = top[np.argsort(distances[top])[::-1]][1:]
 
         recommended = []
         for i in movies_list:
-            similarity_score = distances[i[0]]
+            similarity_score = distances[i]
             if similarity_score >= min_similarity:
                 recommended.append({
-                    'title': movies.iloc[i[0]][title_col],
-                    'movie_id': movies.iloc[i[0]][id_col],
-                    'similarity': round(similarity_score * 100, 1)
+                    'title': TITLES_ARR[i],
+                    'movie_id': int(IDS_ARR[i]),
+                    'similarity': round(float(similarity_score) * 100, 1)
                 })
         return recommended
     except (IndexError, KeyError) as e:
@@ -139,28 +395,29 @@ def batch_recommend(selected_movies, num_recommendations=5):
         return []
     
     try:
-        title_col = 'title_x' if 'title_x' in movies.columns else 'title'
-        id_col = 'movie_id' if 'movie_id' in movies.columns else 'id'
-        
         # Get indices of selected movies
-        indices = [movies[movies[title_col] == movie].index[0] for movie in selected_movies]
+        indices = [TITLE_TO_IDX[movie] for movie in selected_movies]
         
-        # Average similarity scores
-        avg_similarity = similarity[indices].mean(axis=0)
+        # Summed similarity scores, masking the seeds so they can never rank
+        sum_similarity = masked_sum_similarity(indices)
+        
+        # Also mask other catalog rows sharing a seed's title, so a duplicate
+        # entry is never recommended back
+        masked = [i for movie in selected_movies for i in TITLE_TO_INDICES[movie]]
+        sum_similarity[masked] = -np.inf
         
         # Get top recommendations
-        movies_list = sorted(list(enumerate(avg_similarity)), reverse=True, key=lambda x: x[1])
+        k = min(num_recommendations, len(sum_similarity) - len(set(masked)))
+        if k <= 0:
+            return []
+        top = np.argpartition(sum_similarity, -k)[-k:]
+        movies_list = top[np.argsort(sum_similarity[top])[::-1]]
         
-        # Filter out selected movies
-        recommended = []
-        for i in movies_list:
-            movie_title = movies.iloc[i[0]][title_col]
-            if movie_title not in selected_movies and len(recommended) < num_recommendations:
-                recommended.append({
-                    'title': movie_title,
-                    'movie_id': movies.iloc[i[0]][id_col],
-                    'similarity': round(avg_similarity[i[0]] * 100, 1)
-                })
+        recommended = [{
+            'title': TITLES_ARR[i],
+            'movie_id': int(IDS_ARR[i]),
+            'similarity': round(float(sum_similarity[i]) / len(indices) * 100, 1)
+        } for i in movies_list]
         
         return recommended
     except Exception as e:
@@ -174,8 +431,7 @@ def get_available_genres():
 
 def filter_movies_by_genre(genre):
     """Filter movies by selected genre"""
-    title_col = 'title_x' if 'title_x' in movies.columns else 'title'
-    return movies[title_col].values
+    return TITLES_ARR
 
 # ==================== ANALYTICS ====================
 def display_analytics():
@@ -185,7 +441,7 @@ def display_analytics():
     
     col1, col2 = st.sidebar.columns(2)
     with col1:
-        st.metric("Total Movies", f"{len(movies):,}")
+        st.metric("Total Movies", f"{len(TITLES_ARR):,}")
     with col2:
         st.metric("Avg Similarity", "82%")
     
@@ -196,10 +452,6 @@ def display_analytics():
 
 # ==================== MAIN APP ====================
 def main():
-    # Get column names dynamically
-    title_col = 'title_x' if 'title_x' in movies.columns else 'title'
-    id_col = 'movie_id' if 'movie_id' in movies.columns else 'id'
-    
     # Header
     st.title("🍿 CineSuggest")
     st.markdown("### Your Intelligent Movie Recommendation Engine")
@@ -254,27 +506,26 @@ def main():
             help="Start typing to search"
         )
         
-        # Show selected movie details
-        if selected_movie:
+        # Show selected movie details only on request, so browsing the
+        # dropdown doesn't fire a TMDB call for every selection
+        if selected_movie and st.checkbox("Preview selected movie", value=False):
+            movie_id = IDS_ARR[TITLE_TO_IDX[selected_movie]]
+            info = fetch_movie_with_poster(movie_id)
             col1, col2 = st.columns([1, 3])
             
             with col1:
                 try:
-                    movie_id = movies[movies[title_col] == selected_movie].iloc[0][id_col]
-                    poster_url = fetch_poster(movie_id)
-                    st.image(poster_url, width=150)
+                    st.image(info['poster'], width=150)
                 except:
                     st.image("https://via.placeholder.com/150x225?text=No+Poster", width=150)
             
             with col2:
                 try:
-                    movie_id = movies[movies[title_col] == selected_movie].iloc[0][id_col]
-                    details = fetch_movie_details(movie_id)
-                    st.markdown(f"**Year:** {details['year']}")
-                    st.markdown(f"**Rating:** ⭐ {details['rating']}/10")
-                    st.markdown(f"**Genres:** {details['genres']}")
+                    st.markdown(f"**Year:** {info['year']}")
+                    st.markdown(f"**Rating:** ⭐ {info['rating']}/10")
+                    st.markdown(f"**Genres:** {info['genres']}")
                     with st.expander("📖 Overview"):
-                        st.write(details['overview'])
+                        st.write(info['overview'])
                 except:
                     st.info("Movie details not available")
         
@@ -286,25 +537,27 @@ def main():
                 if not recommendations:
                     st.warning("No recommendations found. Try lowering the similarity threshold.")
                 else:
+                    # Fetch all TMDB details up front, in parallel, so rendering does no IO
+                    details_by_id = fetch_movies([rec['movie_id'] for rec in recommendations])
+                    
                     st.success(f"✨ Found {len(recommendations)} movies similar to **{selected_movie}**")
                     st.markdown("---")
                     
                     # Display recommendations
                     for idx, rec in enumerate(recommendations, 1):
+                        details = details_by_id[rec['movie_id']]
                         with st.container():
                             col1, col2, col3 = st.columns([1, 3, 1])
                             
                             with col1:
                                 try:
-                                    poster = fetch_poster(rec['movie_id'])
-                                    st.image(poster, width=120)
+                                    st.image(details['poster'], width=120)
                                 except:
                                     st.image("https://via.placeholder.com/120x180?text=No+Poster", width=120)
                             
                             with col2:
                                 st.markdown(f"### {idx}. {rec['title']}")
                                 try:
-                                    details = fetch_movie_details(rec['movie_id'])
                                     st.caption(f"⭐ {details['rating']}/10 • {details['year']} • {details['genres']}")
                                     st.write(details['overview'][:150] + "..." if len(details['overview']) > 150 else details['overview'])
                                 except:
@@ -324,7 +577,7 @@ def main():
         # Multi-select
         selected_movies = st.multiselect(
             "Select movies you like:",
-            movies[title_col].values,
+            TITLES_ARR,
             max_selections=5,
             help="Choose 2-5 movies"
         )
@@ -335,16 +588,19 @@ def main():
                     recommendations = batch_recommend(selected_movies, num_recs)
                     
                     if recommendations:
+                        # Fetch all TMDB details up front, in parallel, so rendering does no IO
+                        details_by_id = fetch_movies([rec['movie_id'] for rec in recommendations])
+                        
                         st.success(f"✨ Movies that match your taste in: {', '.join(selected_movies)}")
                         st.markdown("---")
                         
                         # Display in grid
                         cols = st.columns(3)
                         for idx, rec in enumerate(recommendations):
+                            details = details_by_id[rec['movie_id']]
                             with cols[idx % 3]:
                                 try:
-                                    poster = fetch_poster(rec['movie_id'])
-                                    st.image(poster, width="stretch")
+                                    st.image(details['poster'], width="stretch")
                                 except:
                                     st.image("https://via.placeholder.com/300x450?text=No+Poster", width="stretch")
                                 st.markdown(f"**{rec['title']}**")
@@ -361,20 +617,21 @@ def main():
         st.info("Feeling adventurous? Let us surprise you!")
         
         if st.button("🎲 Show Random Movies", type="primary"):
-            random_movies = movies.sample(n=min(num_recs, len(movies)))
+            k = min(num_recs, len(TITLES_ARR))
+            idx_sample = np.random.default_rng().choice(len(TITLES_ARR), size=k, replace=False)
+            details_by_id = fetch_movies(IDS_ARR[idx_sample])
             
             cols = st.columns(3)
-            for idx, (_, movie) in enumerate(random_movies.iterrows()):
+            for idx, j in enumerate(idx_sample):
+                title = TITLES_ARR[j]
+                details = details_by_id[IDS_ARR[j]]
                 with cols[idx % 3]:
                     try:
-                        poster = fetch_poster(movie[id_col])
-                        st.image(poster, width="stretch")
-                        st.markdown(f"**{movie[title_col]}**")
-                        details = fetch_movie_details(movie[id_col])
-                        st.caption(f"⭐ {details['rating']}/10 • {details['year']}")
+                        st.image(details['poster'], width="stretch")
                     except:
                         st.image("https://via.placeholder.com/300x450?text=No+Poster", width="stretch")
-                        st.markdown(f"**{movie[title_col]}**")
+                    st.markdown(f"**{title}**")
+                    st.caption(f"⭐ {details['rating']}/10 • {details['year']}")
     
     # Footer
     st.markdown("---")